@@ -1,6 +1,7 @@
 from flask import Flask, jsonify, request, Response, make_response, stream_with_context
 from flask_cors import CORS
 import logging
+import logging.handlers
 import queue
 from core.utils import sanitize_name, get_nifti_dimensions, list_folder_subfolders, get_folder_names
 from core.processing import STEP_COMPLETION_QUEUE, BASE_DATA_PATH, processing_event, run_processing, read_json_file
@@ -9,6 +10,21 @@ app = Flask(__name__)
 CORS(app, supports_credentials=True)
 logger = logging.getLogger(__name__)
 
+def setup_async_logging() -> logging.handlers.QueueListener:
+    """
+    Route all log records through an unbounded queue drained by a background thread.
+
+    Pipeline workers then never block on a synchronous log flush (stdout or an
+    NFS-backed log file); the listener thread absorbs the write latency.
+    """
+    log_queue: queue.Queue = queue.Queue(-1)
+    root = logging.getLogger()
+    handlers = root.handlers or [logging.StreamHandler()]
+    listener = logging.handlers.QueueListener(log_queue, *handlers, respect_handler_level=True)
+    root.handlers = [logging.handlers.QueueHandler(log_queue)]
+    listener.start()
+    return listener
+
 @app.get("/")
 def home() -> str:
     """Basic home endpoint."""
@@ -121,4 +137,5 @@ def get_series(patient: str, study: str) -> Response:
     return jsonify(series_dict)
 
 if __name__ == "__main__":
+    setup_async_logging()
     app.run(host="0.0.0.0", port=5001)
@@ -96,7 +96,7 @@ def process_paired_volumes(left_file: pathlib.Path, right_file: pathlib.Path) ->
                 "RHS Volume (mm3)": rhs_volume
             })
         except (IndexError, ValueError) as e:
-            logger.warning(f"Row {idx}: Skipping row due to error: {e}")
+            logger.warning("Row %s: Skipping row due to error: %s", idx, e)
     return volumes
 
 
@@ -156,7 +156,7 @@ def process_brain_stem(mri: pathlib.Path) -> List[Dict[str, Union[str, float]]]:
                 "Volume (mm3)": round(float(row[1]), 2)
             })
         except (IndexError, ValueError) as e:
-            logger.warning(f"Brain stem row {idx} error with row {row}: {e}")
+            logger.warning("Brain stem row %s error with row %s: %s", idx, row, e)
     return volumes
 
 
@@ -188,7 +188,7 @@ def process_thalamus(mri: pathlib.Path) -> List[Dict[str, Union[str, float]]]:
                 name = row[0].replace("Right-", "")
                 rhs_nuclei.append({name: round(float(row[1]), 2)})
         except (IndexError, ValueError) as e:
-            logger.warning(f"Thalamus row {idx} error with row {row}: {e}")
+            logger.warning("Thalamus row %s error with row %s: %s", idx, row, e)
     return [{
         "Structure": name,
         "LHS Volume (mm3)": get_volume(name, lhs_nuclei),
@@ -302,7 +302,7 @@ def get_brainvol(stats: pathlib.Path) -> List[Dict[str, str | int]]:
                 "Volume (mm3)": int(float(row[-2][:-1]))
             })
         except (IndexError, ValueError) as e:
-            logger.warning(f"Brainvol row {idx} error with row {row}: {e}")
+            logger.warning("Brainvol row %s error with row %s: %s", idx, row, e)
     return brainvol
 
 
@@ -364,7 +364,7 @@ def parse_dkt(file: pathlib.Path) -> List[Dict[str, Union[str, float]]]:
                 "Mean Curvature (mm-1)": float(fields[6])
             })
         except (IndexError, ValueError) as err:
-            logger.warning(f"DKT row {id_row} error with fields {fields}: {err}")
+            logger.warning("DKT row %s error with fields %s: %s", id_row, fields, err)
     return entries
 
 
@@ -448,87 +448,142 @@ def run_jsonifier(
             with out_file.open("w") as f:
                 # noinspection PyTypeChecker
                 json.dump(data, f, indent=4)
-            logger.info(f"Wrote {fname} to {out_file}")
+            logger.info("Wrote %s to %s", fname, out_file)
         except Exception as e:
-            logger.error(f"Error writing {fname}: {e}")
+            logger.error("Error writing %s: %s", fname, e)
 
 
-def run_json_average(json_path: pathlib.Path, folders: List[str], main_type: str) -> None:
+def _accumulate_json(path: pathlib.Path,
+                     cumulative_data: Dict[str, Dict[str, defaultdict]],
+                     counts: Dict[str, Dict[str, int]]) -> None:
     """
-    Average numerical volume values across JSON files from multiple folders.
+    Accumulate numerical volume data from one JSON file into the running totals.
 
-    For each JSON file located under the provided folder names, this function accumulates numerical
-    volume data and computes an average per structure. The averaged results are written to an "AVERAGES"
-    subfolder under the given json_path.
+    Missing files, decode errors, and malformed entries are logged and skipped so a single
+    bad series does not abort the averaging pass.
 
     Args:
-        json_path (pathlib.Path): The base directory containing the JSON files.
-        folders (List[str]): A list of folder names that each contain a JSON file of type `main_type`.
-        main_type (str): The filename (within each folder) to process (e.g., "subcortical.json").
+        path (pathlib.Path): The JSON file to read.
+        cumulative_data (Dict): Running per-structure totals, updated in place.
+        counts (Dict): Running per-structure sample counts, updated in place.
 
     Returns:
         None
     """
-    cumulative_data: Dict[str, Dict[str, defaultdict]] = {}
-    counts: Dict[str, Dict[str, int]] = {}
-    json_files = [json_path / folder / main_type for folder in folders]
-
-    for path in json_files:
-        if not path.exists():
-            logger.warning(f"File not found: {path}")
-            continue
-        try:
-            with path.open("r") as f:
-                data = json.load(f)
-        except json.JSONDecodeError as e:
-            logger.warning(f"JSON decode error in file {path}: {e}")
-            continue
-
-        for top_key, entries in data.items():
-            if top_key not in cumulative_data:
-                cumulative_data[top_key] = {}
-                counts[top_key] = {}
-            for entry in entries:
-                structure = entry.get("Structure")
-                if not structure:
-                    logger.warning(f"Missing 'Structure' in entry {entry} in file {path}")
+    if not path.exists():
+        logger.warning("File not found: %s", path)
+        return
+    try:
+        with path.open("r") as f:
+            data = json.load(f)
+    except json.JSONDecodeError as e:
+        logger.warning("JSON decode error in file %s: %s", path, e)
+        return
+
+    for top_key, entries in data.items():
+        if top_key not in cumulative_data:
+            cumulative_data[top_key] = {}
+            counts[top_key] = {}
+        for entry in entries:
+            structure = entry.get("Structure")
+            if not structure:
+                logger.warning("Missing 'Structure' in entry %s in file %s", entry, path)
+                continue
+            if structure not in cumulative_data[top_key]:
+                cumulative_data[top_key][structure] = defaultdict(float)
+                counts[top_key][structure] = 0
+            counts[top_key][structure] += 1
+            for key, value in entry.items():
+                if key == "Structure":
                     continue
-                if structure not in cumulative_data[top_key]:
-                    cumulative_data[top_key][structure] = defaultdict(float)
-                    counts[top_key][structure] = 0
-                counts[top_key][structure] += 1
-                for key, value in entry.items():
-                    if key == "Structure":
-                        continue
-                    if isinstance(value, (int, float)):
-                        cumulative_data[top_key][structure][key] += value
-                    else:
-                        logger.warning(f"Non-numeric value for key '{key}' in entry {entry} in file {path}")
-
-    averaged_result = {}
+                if isinstance(value, (int, float)):
+                    cumulative_data[top_key][structure][key] += value
+                else:
+                    logger.warning("Non-numeric value for key '%s' in entry %s in file %s", key, entry, path)
+
+
+def _compute_averages(cumulative_data: Dict[str, Dict[str, defaultdict]],
+                      counts: Dict[str, Dict[str, int]]) -> Dict[str, List]:
+    """
+    Turn accumulated totals and counts into per-structure averages.
+
+    Args:
+        cumulative_data (Dict): Per-structure totals keyed by top-level section.
+        counts (Dict): Per-structure sample counts keyed by top-level section.
+
+    Returns:
+        Dict[str, List]: Averaged entries per section, sorted by structure name.
+    """
+    averaged_result: Dict[str, List] = {}
     for top_key, structures in cumulative_data.items():
         averaged_result[top_key] = []
         for structure, totals in structures.items():
             count = counts[top_key][structure]
             if count == 0:
-                logger.warning(f"No data to average for '{structure}' under '{top_key}'")
+                logger.warning("No data to average for '%s' under '%s'", structure, top_key)
                 continue
             averaged_entry = {"Structure": structure}
             for key, total in totals.items():
                 averaged_entry[key] = round(total / count, 2)
             averaged_result[top_key].append(averaged_entry)
         averaged_result[top_key].sort(key=lambda x: x["Structure"])
+    return averaged_result
+
+
+def run_json_averages(json_path: pathlib.Path, folders: List[str], main_types: List[str]) -> None:
+    """
+    Average numerical volume values across JSON files for several file types in one pass.
+
+    The folder list is traversed a single time and the totals for all requested file types
+    (e.g. "cortical.json", "subcortical.json", "general.json") are accumulated together,
+    instead of re-walking the tree once per type. The averaged results are written to an
+    "AVERAGES" subfolder under the given json_path, one output file per type.
+
+    Args:
+        json_path (pathlib.Path): The base directory containing the JSON files.
+        folders (List[str]): A list of folder names that each contain the JSON files.
+        main_types (List[str]): The filenames (within each folder) to process.
+
+    Returns:
+        None
+    """
+    cumulative_data: Dict[str, Dict[str, Dict[str, defaultdict]]] = {t: {} for t in main_types}
+    counts: Dict[str, Dict[str, Dict[str, int]]] = {t: {} for t in main_types}
+
+    for folder in folders:
+        for main_type in main_types:
+            _accumulate_json(json_path / folder / main_type, cumulative_data[main_type], counts[main_type])
 
     averages_folder = json_path / "AVERAGES"
     averages_folder.mkdir(parents=True, exist_ok=True)
-    output_file = averages_folder / main_type
-    try:
-        with output_file.open("w") as f:
-            # noinspection PyTypeChecker
-            json.dump(averaged_result, f, indent=4)
-        logger.info(f"Averaged data written to {output_file}")
-    except Exception as e:
-        logger.error(f"Error writing to file {output_file}: {e}")
+    for main_type in main_types:
+        averaged_result = _compute_averages(cumulative_data[main_type], counts[main_type])
+        output_file = averages_folder / main_type
+        try:
+            with output_file.open("w") as f:
+                # noinspection PyTypeChecker
+                json.dump(averaged_result, f, indent=4)
+            logger.info("Averaged data written to %s", output_file)
+        except Exception as e:
+            logger.error("Error writing to file %s: %s", output_file, e)
+
+
+def run_json_average(json_path: pathlib.Path, folders: List[str], main_type: str) -> None:
+    """
+    Average numerical volume values across JSON files from multiple folders.
+
+    Thin wrapper around run_json_averages for a single file type, kept for callers that
+    only need one type averaged.
+
+    Args:
+        json_path (pathlib.Path): The base directory containing the JSON files.
+        folders (List[str]): A list of folder names that each contain a JSON file of type `main_type`.
+        main_type (str): The filename (within each folder) to process (e.g., "subcortical.json").
+
+    Returns:
+        None
+    """
+    run_json_averages(json_path=json_path, folders=folders, main_types=[main_type])
 
 
 def run_global_json(json_path: pathlib.Path, folders: List[str]) -> None:
@@ -559,7 +614,7 @@ def run_global_json(json_path: pathlib.Path, folders: List[str]) -> None:
             with (json_path / folder / "general.json").open("r") as f:
                 global_general[folder] = json.load(f)
         except Exception as e:
-            logger.error(f"Error reading JSON files from folder {folder}: {e}")
+            logger.error("Error reading JSON files from folder %s: %s", folder, e)
 
     try:
         with (json_path / "AVERAGES" / "subcortical.json").open("r") as f:
@@ -569,7 +624,7 @@ def run_global_json(json_path: pathlib.Path, folders: List[str]) -> None:
         with (json_path / "AVERAGES" / "general.json").open("r") as f:
             global_general["AVERAGES"] = json.load(f)
     except Exception as e:
-        logger.error(f"Error reading AVERAGES JSON files: {e}")
+        logger.error("Error reading AVERAGES JSON files: %s", e)
 
     for fname, data in [
         ("subcortical.json", global_subcortical),
@@ -580,6 +635,6 @@ def run_global_json(json_path: pathlib.Path, folders: List[str]) -> None:
             with (json_path / fname).open("w") as f:
                 # noinspection PyTypeChecker
                 json.dump(data, f, indent=4)
-            logger.info(f"Wrote global JSON to {json_path / fname}")
+            logger.info("Wrote global JSON to %s", json_path / fname)
         except Exception as e:
-            logger.error(f"Error writing global JSON file {fname}: {e}")
+            logger.error("Error writing global JSON file %s: %s", fname, e)
@@ -4,7 +4,7 @@ import os
 import time
 import queue
 from pathlib import Path
-from concurrent.futures import ThreadPoolExecutor, as_completed
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
 from threading import Event
 from typing import List, Dict
 from functools import partial
@@ -13,7 +13,7 @@ import dicom2nifti
 import pydicom
 from werkzeug.datastructures import ImmutableMultiDict, FileStorage
 
-from core.jsonifier import run_jsonifier, run_json_average, run_global_json
+from core.jsonifier import run_jsonifier, run_json_averages, run_global_json
 from core.utils import (
     add_dcm_extension,
     get_folder_names,
@@ -22,7 +22,9 @@ from core.utils import (
     process_lesions,
     segment_subregions,
     segment_hypothalamus,
-    process_corestats
+    process_corestats,
+    _existing_names,
+    _physical_cpus,
 )
 
 logger = logging.getLogger(__name__)
@@ -57,7 +59,13 @@ def save_dicoms(request_files: ImmutableMultiDict[str, FileStorage], dicom_direc
                 logger.info("Skipping DICOMDIR file based on filename: %s", dicom_file.filename)
                 continue
 
-            ds = pydicom.dcmread(dicom_file)
+            # Only the two tags consulted below are needed, so stop the parse
+            # before the pixel data instead of reading the whole file.
+            ds = pydicom.dcmread(
+                dicom_file,
+                stop_before_pixels=True,
+                specific_tags=["SOPClassUID", "SeriesDescription"],
+            )
             if str(getattr(ds, "SOPClassUID", "")) == str(pydicom.uid.MediaStorageDirectoryStorage):
                 logger.info("Skipping DICOMDIR file based on SOPClassUID: %s", dicom_file.filename)
                 continue
@@ -76,16 +84,19 @@ def convert_to_nifti(dicom_directory: Path, nifti_directory: Path) -> None:
     """
     Convert each DICOM series in the dicom_directory to a single NIfTI file.
     """
-    for folder in get_folder_names(dicom_directory):
-        input_dir = dicom_directory / folder
-        output_file = nifti_directory / f"{folder}.nii.gz"
-        try:
-            dicom2nifti.dicom_series_to_nifti(
-                original_dicom_directory=str(input_dir),
-                output_file=str(output_file)
-            )
-        except Exception as e:
-            logger.exception("Error converting folder %s: %s", folder, e)
+    # os.scandir carries the entry type from getdents, avoiding a stat per series.
+    with os.scandir(dicom_directory) as it:
+        for series in it:
+            if not series.is_dir(follow_symlinks=False):
+                continue
+            output_file = nifti_directory / f"{series.name}.nii.gz"
+            try:
+                dicom2nifti.dicom_series_to_nifti(
+                    original_dicom_directory=series.path,
+                    output_file=str(output_file)
+                )
+            except Exception as e:
+                logger.exception("Error converting folder %s: %s", series.name, e)
     logger.info("NIFTI conversion completed")
 
 def run_reconall(base_dir: Path) -> None:
@@ -115,31 +126,67 @@ def process_lesions_for_all(folders: List[str], freesurfer_path: Path, samseg_pa
     """
     Process lesions for all series in parallel.
     """
-    with ThreadPoolExecutor(max_workers=max(1, os.cpu_count())) as executor:
+    with ThreadPoolExecutor(max_workers=_physical_cpus()) as executor:
         executor.map(partial(process_lesions_for_series, freesurfer_path=freesurfer_path, samseg_path=samseg_path), folders)
     logger.info("SAMSEG processing completed")
 
-def segment_subregions_for_all(folders: List[str], freesurfer_path: Path) -> None:
+def _run_postrecon_task(task: tuple, subject_dir: Path, threads_per_subject: int) -> None:
     """
-    Run subcortical segmentation (thalamus, brainstem, hippo-amygdala) for each series.
+    Execute one (kind, subject_id) post-recon segmentation task in a pool worker.
     """
-    for folder in folders:
-        for structure in ["thalamus", "brainstem", "hippo-amygdala"]:
+    kind, subject_id = task
+    if kind == "hypothalamus":
+        segment_hypothalamus(subject_id=subject_id, subject_dir=subject_dir, threads=threads_per_subject)
+    else:
+        segment_subregions(structure=kind, subject_id=subject_id, subject_dir=subject_dir,
+                           threads=threads_per_subject)
+
+def run_postrecon_parallel(subject_ids: List[str],
+                           subject_dir: Path,
+                           kinds: tuple = ("thalamus", "brainstem", "hippo-amygdala", "hypothalamus"),
+                           threads_per_subject: int | None = None) -> None:
+    """
+    Run independent post-recon segmentations concurrently, one task per (kind, subject).
+
+    Each task is an independent external binary, so N subjects run in parallel
+    through a process pool sized so that threads_per_subject * workers never
+    exceeds the physical core count — the per-tool thread budget and the pool
+    width split the machine instead of multiplying against each other.
+    """
+    if not subject_ids:
+        return
+    if threads_per_subject is None:
+        threads_per_subject = max(1, _physical_cpus() // len(subject_ids))
+    tasks = [(kind, subject_id) for subject_id in subject_ids for kind in kinds]
+    max_workers = max(1, _physical_cpus() // threads_per_subject)
+    with ProcessPoolExecutor(max_workers=max_workers) as executor:
+        futures = {
+            executor.submit(_run_postrecon_task, task, subject_dir, threads_per_subject): task
+            for task in tasks
+        }
+        for future in as_completed(futures):
+            kind, subject_id = futures[future]
             try:
-                segment_subregions(structure=structure, subject_id=folder, subject_dir=freesurfer_path)
+                future.result()
             except Exception as e:
-                logger.exception("Error segmenting %s for series %s: %s", structure, folder, e)
+                logger.exception("Error segmenting %s for series %s: %s", kind, subject_id, e)
+
+def segment_subregions_for_all(folders: List[str], freesurfer_path: Path) -> None:
+    """
+    Run subcortical segmentation (thalamus, brainstem, hippo-amygdala) for each series.
+    """
+    # Warm the directory-listing cache for all subjects concurrently; stat/getdents
+    # release the GIL, so the pre-flight scans overlap instead of serializing.
+    with ThreadPoolExecutor(max_workers=32) as executor:
+        list(executor.map(lambda f: _existing_names(freesurfer_path / f / "mri"), folders))
+    run_postrecon_parallel(folders, freesurfer_path, kinds=("thalamus", "brainstem", "hippo-amygdala"))
     logger.info("Subcortical segmentation completed")
 
 def segment_hypothalamus_for_all(folders: List[str], freesurfer_path: Path) -> None:
     """
     Run hypothalamus segmentation for each series.
     """
-    for folder in folders:
-        try:
-            segment_hypothalamus(subject_id=folder, subject_dir=freesurfer_path)
-        except Exception as e:
-            logger.exception("Error segmenting hypothalamus for series %s: %s", folder, e)
+    run_postrecon_parallel(folders, freesurfer_path, kinds=("hypothalamus",))
     logger.info("FreeSurfer hypothalamus segmentation completed")
 
 
@@ -165,9 +212,11 @@ def generate_json_files(folders: List[str],
     averages_dir = json_folder / "AVERAGES"
     averages_dir.mkdir(parents=True, exist_ok=True)
     try:
-        run_json_average(json_path=json_folder, folders=folders, main_type="cortical.json")
-        run_json_average(json_path=json_folder, folders=folders, main_type="subcortical.json")
-        run_json_average(json_path=json_folder, folders=folders, main_type="general.json")
+        run_json_averages(
+            json_path=json_folder,
+            folders=folders,
+            main_types=["cortical.json", "subcortical.json", "general.json"],
+        )
         run_global_json(json_path=json_folder, folders=folders)
     except Exception as e:
         logger.exception("Error generating average/global JSON files: %s", e)
@@ -193,7 +242,7 @@ def process_corestats_for_all(folders: List[str],
     """
     Process core statistics for all series in parallel.
     """
-    with ThreadPoolExecutor(max_workers=max(1, os.cpu_count())) as executor:
+    with ThreadPoolExecutor(max_workers=_physical_cpus()) as executor:
         futures = [
             executor.submit(process_corestats_for_series, series, freesurfer_path, corestats_folder)
             for series in folders
@@ -1,5 +1,9 @@
+import copy
+import functools
 import os
+import pickle
 import platform
+import shutil
 from pathlib import Path
 from concurrent.futures import ThreadPoolExecutor
 import logging
@@ -15,15 +19,34 @@ from nipype.pipeline.engine import Workflow, Node
 from functools import partial
 from typing import List, Any
 
+from core.utils import (
+    _done_key,
+    _existing_names,
+    _omp_environ,
+    _path_exists,
+    _physical_cpus,
+    _stage_done,
+    mark_stage_complete,
+    uring_exists_many,
+    write_done_sentinel,
+)
+
 logger = logging.getLogger(__name__)
 
 class RunFastSurferInputSpec(CommandLineInputSpec):
-    t1 = File(argstr="--t1 %s", exists=True, mandatory=True, desc="Path to T1-weighted NIfTI image")
-    sid = traits.Str(argstr="--sid %s", mandatory=True, desc="Subject ID")
+    t1 = File(argstr="--t1 %s", exists=True, mandatory=True, xor=["sid_list"],
+              desc="Path to T1-weighted NIfTI image")
+    sid = traits.Str(argstr="--sid %s", mandatory=True, xor=["sid_list"], desc="Subject ID")
+    sid_list = File(argstr="--subject_list %s", exists=True, xor=["t1", "sid"],
+                    desc="CSV of subject_id,t1_path pairs processed in one invocation")
     sd = Directory(argstr="--sd %s", mandatory=True, desc="Directory for FastSurfer output")
     no_asegdkt = traits.Bool(argstr="--no_asegdkt", usedefault=True, desc="Omit ASEG and DKT segmentations")
     parallel = traits.Bool(argstr="--parallel", usedefault=True, desc="Use parallel processing")
-    threads = traits.Int(argstr="--threads %d", usedefault=True, default_value=4, desc="Number of threads")
+    threads = traits.Int(argstr="--threads %d", usedefault=True,
+                         default_value=max(1, (os.cpu_count() or 4) - 1),
+                         desc="Number of threads (default: all cores minus one for the orchestrator)")
+    device = traits.Str(argstr="--device %s", desc="Compute device for the CNN stages (e.g. 'cuda', 'cpu')")
+    batch_size = traits.Int(argstr="--batch_size %d", desc="Inference batch size for the CNN stages")
 
 
 class RunFastSurfer(CommandLine):
@@ -32,40 +55,205 @@ class RunFastSurfer(CommandLine):
     output_spec = TraitedSpec
 
 
-def run_fastsurfer(fs_dir: Path, t1: Path, sid: str, sd: Path, wf_dir: Path, threads: int) -> None:
+# Instantiated once at import so the traits metaclass work is paid a single
+# time per process (and inherited by forked workers); the trait descriptors
+# live on the class, so a shallow copy per use is O(1).
+_FASTSURFER_TEMPLATE = RunFastSurfer()
+
+
+@functools.lru_cache(maxsize=1)
+def dl_backend_available() -> bool:
+    """
+    Report whether a CUDA-capable deep-learning backend is usable.
+
+    FastSurfer's CNN stages run orders of magnitude faster on a GPU; when torch
+    is importable and sees a CUDA device, callers route the segmentations there
+    instead of the CPU path. Without torch (or without a GPU) this is False and
+    everything stays on the classic CPU path.
+    """
+    try:
+        import torch
+    except ImportError:
+        return False
+    return bool(torch.cuda.is_available())
+
+
+@functools.lru_cache(maxsize=1)
+def _numa_node_count() -> int:
+    """
+    Return the number of NUMA nodes the host exposes (1 when unknown).
+    """
+    try:
+        return sum(
+            1 for entry in os.scandir("/sys/devices/system/node")
+            if entry.name.startswith("node") and entry.name[4:].isdigit()
+        ) or 1
+    except OSError:
+        return 1
+
+
+@functools.lru_cache(maxsize=None)
+def _numa_prefix(slot: int | None = None) -> str:
+    """
+    Return a numactl binding prefix when the host spans multiple NUMA nodes.
+
+    Pinning each FastSurfer run to one node keeps its OpenMP threads and their
+    memory on the same socket, avoiding cross-socket cache traffic that inflates
+    thread synchronization cost. Concurrent runs pass their slot index so they
+    round-robin across the nodes instead of piling onto node 0; with slot=None
+    (a lone run that should span the machine), on single-node hosts, or without
+    numactl installed the prefix is empty.
+    """
+    if slot is None or shutil.which("numactl") is None:
+        return ""
+    nodes = _numa_node_count()
+    if nodes < 2:
+        return ""
+    node = slot % nodes
+    return f"numactl --cpunodebind={node} --membind={node} "
+
+
+@functools.lru_cache(maxsize=1)
+def _build_fastsurfer_template() -> bytes:
+    """
+    Build the FastSurfer workflow skeleton once and cache it in pickled form.
+
+    Callers unpickle a fresh copy and rebind the per-invocation inputs, so graph
+    construction and trait validation happen a single time per process.
+    """
+    fastsurfer_node = Node(copy.copy(_FASTSURFER_TEMPLATE), name="run_fastsurfer")
+    wf = Workflow(name="fastsurfer_workflow")
+    wf.add_nodes([fastsurfer_node])
+    return pickle.dumps(wf)
+
+
+def run_fastsurfer(fs_dir: Path, t1: Path, sid: str, sd: Path, wf_dir: Path, threads: int,
+                   full_pipeline: bool = False, outer_parallel: bool = False,
+                   numa_slot: int | None = None) -> None:
     """
     Run FastSurfer segmentation workflow if the expected output files do not exist.
+
+    With full_pipeline=True the ASEG/DKT segmentations are kept as well, so
+    FastSurfer acts as the DL replacement for recon-all instead of only
+    supplementing it with the extra segmentation modules. Pass
+    outer_parallel=True when an outer pool already runs several subjects at
+    once: FastSurfer's own hemisphere parallelism is then disabled so the
+    subject-level and tool-level parallelism do not multiply into
+    oversubscription; the caller is expected to split threads accordingly and
+    to pass its slot index as numa_slot so concurrent runs spread across the
+    host's NUMA nodes.
     """
-    output_files = [
-        sd / sid / "mri" / "cerebellum.CerebNet.nii.gz",
-        sd / sid / "mri" / "hypothalamus.HypVINN.nii.gz",
-        sd / sid / "mri" / "hypothalamus_mask.HypVINN.nii.gz",
-        sd / sid / "stats" / "cerebellum.CerebNet.stats",
-        sd / sid / "stats" / "hypothalamus.HypVINN.stats",
-    ]
-    if all(f.exists() for f in output_files):
+    # The cohort manifest answers the pre-flight from one file; the sentinel
+    # remains as the fallback for cohorts predating it.
+    if _stage_done(sd.parent, sid, "fastsurfer"):
+        logger.info("Skipping FastSurfer segmentations (manifest)")
+        return
+    # On-disk memo keyed on the T1 mtime: one lstat answers reruns, and a
+    # reprocessed T1 invalidates the memo automatically.
+    memo = None
+    key = _done_key(sid, "fastsurfer", t1)
+    if key is not None and _path_exists(sd.parent / "JSON"):
+        memo = sd.parent / "JSON" / f"{key}.done"
+        if _path_exists(memo):
+            logger.info("Skipping FastSurfer segmentations (memo)")
+            return
+    # The sentinel collapses the per-subject completion check to one stat.
+    if _path_exists(sd / sid / ".fastsurfer_done"):
+        logger.info("Skipping Hypothalamus and Cerebellum segmentations (sentinel found)")
+        return
+
+    expected_mri = {
+        "cerebellum.CerebNet.nii.gz",
+        "hypothalamus.HypVINN.nii.gz",
+        "hypothalamus_mask.HypVINN.nii.gz",
+    }
+    expected_stats = {
+        "cerebellum.CerebNet.stats",
+        "hypothalamus.HypVINN.stats",
+    }
+    output_files = [sd / sid / "mri" / name for name in sorted(expected_mri)] + \
+                   [sd / sid / "stats" / name for name in sorted(expected_stats)]
+    # One scandir per output directory replaces a stat per expected file.
+    if expected_mri <= _existing_names(sd / sid / "mri") and expected_stats <= _existing_names(sd / sid / "stats"):
+        write_done_sentinel(sd / sid / ".fastsurfer_done", output_files)
         logger.info("Skipping Hypothalamus and Cerebellum segmentations as all output files already exist")
         return
 
-    fastsurfer_instance = RunFastSurfer()
-    fastsurfer_instance._cmd = str(fs_dir / "run_fastsurfer.sh")
-    fastsurfer_node = Node(fastsurfer_instance, name="run_fastsurfer")
+    wf = pickle.loads(_build_fastsurfer_template())
+    wf.base_dir = str(wf_dir)
+    fastsurfer_node = wf.get_node("run_fastsurfer")
+    fastsurfer_node.interface._cmd = f"{_numa_prefix(numa_slot)}{fs_dir / 'run_fastsurfer.sh'}"
     fastsurfer_node.inputs.t1 = str(t1.resolve())
     fastsurfer_node.inputs.sid = sid
     fastsurfer_node.inputs.sd = str(sd.resolve())
     fastsurfer_node.inputs.threads = threads
-
-    wf = Workflow(name="fastsurfer_workflow", base_dir=str(wf_dir))
-    wf.add_nodes([fastsurfer_node])
+    fastsurfer_node.inputs.environ = _omp_environ(threads)
+    if full_pipeline:
+        fastsurfer_node.inputs.no_asegdkt = False
+    if outer_parallel:
+        fastsurfer_node.inputs.parallel = False
+    if dl_backend_available():
+        # Batch size >= 8 keeps the GPU's tensor cores fed instead of
+        # round-tripping one slice stack at a time.
+        fastsurfer_node.inputs.device = "cuda"
+        fastsurfer_node.inputs.batch_size = 8
 
     try:
         wf.run()
         logger.info("FastSurfer workflow completed")
+        if _path_exists(sd / sid):
+            write_done_sentinel(sd / sid / ".fastsurfer_done", output_files)
+            mark_stage_complete(sd.parent, sid, "fastsurfer")
+            if memo is not None:
+                memo.touch()
+    except Exception as e:
+        logger.error("Error during FastSurfer workflow: %s", e)
+        raise
+
+def run_fastsurfer_batch(fs_dir: Path, subjects: List[tuple], sd: Path, wf_dir: Path, threads: int) -> None:
+    """
+    Run FastSurfer once for a whole list of (subject_id, t1_path) pairs.
+
+    One invocation amortizes the model load and CUDA context warm-up over the
+    cohort instead of paying them per subject: the subject list is written as a
+    CSV and handed to run_fastsurfer.sh via --subject_list.
+    """
+    if not subjects:
+        return
+
+    sd.mkdir(parents=True, exist_ok=True)
+    subject_list = sd / "subject_list.csv"
+    subject_list.write_text(
+        "".join(f"{sid},{t1}\n" for sid, t1 in subjects)
+    )
+
+    wf = pickle.loads(_build_fastsurfer_template())
+    wf.base_dir = str(wf_dir)
+    fastsurfer_node = wf.get_node("run_fastsurfer")
+    # A lone batch invocation should span the machine, so no NUMA pinning.
+    fastsurfer_node.interface._cmd = f"{_numa_prefix()}{fs_dir / 'run_fastsurfer.sh'}"
+    fastsurfer_node.inputs.sid_list = str(subject_list)
+    fastsurfer_node.inputs.sd = str(sd.resolve())
+    fastsurfer_node.inputs.threads = threads
+    fastsurfer_node.inputs.environ = _omp_environ(threads)
+    if dl_backend_available():
+        fastsurfer_node.inputs.device = "cuda"
+        fastsurfer_node.inputs.batch_size = 8
+
+    try:
+        wf.run()
+        logger.info("FastSurfer batch of %d subjects completed", len(subjects))
+        for sid, t1 in subjects:
+            if _path_exists(sd / sid):
+                mark_stage_complete(sd.parent, sid, "fastsurfer")
     except Exception as e:
-        logger.error(f"Error during FastSurfer workflow: {e}")
+        logger.error("Error during FastSurfer batch workflow: %s", e)
         raise
 
-def run_fastsurfer_for_series(series: str, freesurfer_path: Path, fastsurfer_path: Path, workflows_path: Path) -> None:
+
+def run_fastsurfer_for_series(series: str, freesurfer_path: Path, fastsurfer_path: Path, workflows_path: Path,
+                              threads: int | None = None, outer_parallel: bool = False,
+                              numa_slot: int | None = None) -> None:
     """
     Run FastSurfer for a single series.
     """
@@ -76,7 +264,9 @@ def run_fastsurfer_for_series(series: str, freesurfer_path: Path, fastsurfer_pat
             sid=series,
             sd=fastsurfer_path,
             wf_dir=workflows_path,
-            threads=max(1, os.cpu_count()),
+            threads=threads if threads is not None else _physical_cpus(),
+            outer_parallel=outer_parallel,
+            numa_slot=numa_slot,
         )
     except Exception as e:
         logger.exception("Error in FastSurfer processing for series %s: %s", series, e)
@@ -92,12 +282,33 @@ def run_fastsurfer_for_all(folders: List[str],
     if platform == "darwin":
         os.environ["PYTORCH_ENABLE_MPS_FALLBACK"] = "1"
 
+    # Each FastSurfer invocation gets cores // slots threads, so the slot count
+    # and the per-subject thread budget split the machine instead of
+    # multiplying against each other; subjects are fed FIFO rather than
+    # spawning one worker per subject.
+    slots = max(1, _physical_cpus() // 4)
+    threads_per_subject = max(1, _physical_cpus() // slots)
+
+    # Checkpoint resume: subjects with a completion marker are not resubmitted.
+    # One batched probe covers the whole cohort instead of a stat per subject.
+    markers = [fastsurfer_path / series / "scripts" / "recon-all.done" for series in folders]
+    pending = [
+        series for series, done in zip(folders, uring_exists_many(markers)) if not done
+    ]
+    if not pending:
+        logger.info("All FastSurfer subjects already completed. Nothing to do.")
+        return
+
     try:
-        with ThreadPoolExecutor(max_workers=max(1, os.cpu_count())) as executor:
+        # Each slot carries its index so concurrent runs round-robin across
+        # the host's NUMA nodes instead of piling onto node 0.
+        run_one = partial(run_fastsurfer_for_series, freesurfer_path=freesurfer_path,
+                          fastsurfer_path=fastsurfer_path, workflows_path=workflows_path,
+                          threads=threads_per_subject, outer_parallel=True)
+        with ThreadPoolExecutor(max_workers=slots) as executor:
             list(executor.map(
-                partial(run_fastsurfer_for_series, freesurfer_path=freesurfer_path, fastsurfer_path=fastsurfer_path,
-                        workflows_path=workflows_path),
-                folders,
+                lambda slot_series: run_one(slot_series[1], numa_slot=slot_series[0]),
+                enumerate(pending),
             ))
         logger.info("Extra subcortical segmentation completed")
     except Exception as e:
@@ -22,4 +22,18 @@ def temp_dir():
     """Create a temporary directory for tests."""
     temp = Path(tempfile.mkdtemp())
     yield temp
-    shutil.rmtree(temp, ignore_errors=True)
\ No newline at end of file
+    shutil.rmtree(temp, ignore_errors=True)
+
+@pytest.fixture(scope="session")
+def shared_fs_tree(tmp_path_factory):
+    """
+    Provide a session-scoped pipeline folder skeleton.
+
+    Tests that only need the directory layout (and do not mutate its contents)
+    share this tree instead of rebuilding it per test, which keeps redundant
+    filesystem setup out of the suite.
+    """
+    root = tmp_path_factory.mktemp("fs")
+    for sub in ("FREESURFER", "SAMSEG", "FASTSURFER", "WORKFLOWS", "NIFTI", "CORESTATS", "JSON"):
+        (root / sub).mkdir()
+    return root
\ No newline at end of file
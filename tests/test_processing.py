@@ -4,7 +4,15 @@ from werkzeug.datastructures import FileStorage, ImmutableMultiDict
 from pathlib import Path
 
 from core.processing import convert_to_nifti, generate_json_files, process_lesions_for_all, save_dicoms
-from core.utils import process_corestats, process_lesions, reconall, segment_hypothalamus, segment_subregions
+from core.utils import (
+    build_pipeline,
+    process_corestats,
+    process_lesions,
+    reconall,
+    segment_all_subregions,
+    segment_hypothalamus,
+    segment_subregions,
+)
 
 
 # --- Fixtures ---
@@ -116,10 +124,27 @@ def test_reconall_setup(temp_dir: Path, mocker):
     workflow_run_mock.assert_called()
 
 
+def test_build_pipeline(temp_dir: Path):
+    """
+    Test that build_pipeline wires recon-all, SAMSEG, and subregion nodes per subject.
+    """
+    nifti_dir = temp_dir / "NIFTI"
+    nifti_dir.mkdir(parents=True)
+    (nifti_dir / "test.nii.gz").touch()
+
+    wf = build_pipeline(temp_dir)
+
+    node_names = wf.list_node_names()
+    assert "reconall_test" in node_names
+    assert "samseg_test" in node_names
+    for structure in ("thalamus", "brainstem", "hippo_amygdala", "hypothalamus"):
+        assert f"{structure}_test" in node_names
+
+
 def test_process_lesions(temp_dir: Path, mocker):
     """
-    Test that process_lesions calls CommandLine.run when the output does not exist,
-    and skips calling it when the output already exists.
+    Test that process_lesions launches SAMSEG when the output does not exist,
+    and skips launching it when the output already exists.
     """
     # Ensure the SAMSEG output file does not exist.
     freesurfer_path = temp_dir / "FREESURFER"
@@ -129,12 +154,13 @@ def test_process_lesions(temp_dir: Path, mocker):
     freesurfer_path.mkdir(parents=True, exist_ok=True)
     samseg_path.mkdir(parents=True, exist_ok=True)
 
-    # Patch CommandLine.run.
-    cmd_run_mock = mocker.patch("nipype.interfaces.base.CommandLine.run")
+    # Patch the subprocess launcher.
+    cmd_run_mock = mocker.patch("core.utils._run")
 
     # First call – file does not exist, so run should be called.
     process_lesions(freesurfer_path, samseg_path, series)
     assert cmd_run_mock.call_count == 1
+    assert cmd_run_mock.call_args.args[0][0] == "run_samseg"
 
     cmd_run_mock.reset_mock()
     # Create the output file so that processing is skipped.
@@ -143,18 +169,18 @@ def test_process_lesions(temp_dir: Path, mocker):
     output_file.touch()
 
     process_lesions(freesurfer_path, samseg_path, series)
-    # Since the file exists, CommandLine.run should not be called again.
+    # Since the file exists, SAMSEG should not be launched again.
     cmd_run_mock.assert_not_called()
 
 
-def test_process_lesions_for_all(temp_dir: Path, mocker):
+def test_process_lesions_for_all(shared_fs_tree: Path, mocker):
     """
     Test that process_lesions_for_all calls process_lesions for each series.
     """
     # Patch the process_lesions function in the app module.
     process_lesions_mock = mocker.patch("core.processing.process_lesions")
-    freesurfer_path = temp_dir / "FREESURFER"
-    samseg_path = temp_dir / "SAMSEG"
+    freesurfer_path = shared_fs_tree / "FREESURFER"
+    samseg_path = shared_fs_tree / "SAMSEG"
     folders = ["series1"]
 
     process_lesions_for_all(folders, freesurfer_path, samseg_path)
@@ -164,20 +190,21 @@ def test_process_lesions_for_all(temp_dir: Path, mocker):
 
 def test_segment_subregions(temp_dir: Path, mocker):
     """
-    Test that segment_subregions calls CommandLine.run if output files are missing,
+    Test that segment_subregions launches the command if output files are missing,
     and skips when all expected output files exist.
     """
     # Use a temporary subject directory.
     subject_dir = temp_dir
     subject_id = "series1"
 
-    # Patch CommandLine.run.
-    cmd_run_mock = mocker.patch("nipype.interfaces.base.CommandLine.run")
+    # Patch the subprocess launcher.
+    cmd_run_mock = mocker.patch("core.utils._run")
 
     # First, call with no existing output files.
     segment_subregions("thalamus", subject_id, subject_dir)
-    # CommandLine.run should be called once.
+    # The command should be launched once, with the structure as first argument.
     assert cmd_run_mock.call_count == 1
+    assert cmd_run_mock.call_args.args[0][:2] == ["segment_subregions", "thalamus"]
 
     cmd_run_mock.reset_mock()
     # Create the expected output files.
@@ -191,37 +218,59 @@ def test_segment_subregions(temp_dir: Path, mocker):
     cmd_run_mock.assert_not_called()
 
 
+def test_segment_all_subregions(temp_dir: Path, mocker):
+    """
+    Test that segment_all_subregions launches the three structures concurrently
+    and drops structures whose outputs already exist.
+    """
+    popen_mock = mocker.patch("core.utils.subprocess.Popen")
+    popen_mock.return_value.wait.return_value = 0
+
+    # Keep the stage manifest inside the test directory.
+    subject_dir = temp_dir / "FREESURFER"
+    subject_dir.mkdir()
+
+    segment_all_subregions("series1", subject_dir)
+    launched = [call.args[0][1] for call in popen_mock.call_args_list]
+    assert launched == ["thalamus", "brainstem", "hippo-amygdala"]
+
+    popen_mock.reset_mock()
+    # All structures are now recorded in the manifest, so nothing is relaunched.
+    segment_all_subregions("series1", subject_dir)
+    popen_mock.assert_not_called()
+
+
 def test_segment_hypothalamus(temp_dir: Path, mocker):
     """
-    Test that segment_hypothalamus calls CommandLine.run.
+    Test that segment_hypothalamus launches the segmentation command.
     """
-    # Patch CommandLine.run.
-    cmd_run_mock = mocker.patch("nipype.interfaces.base.CommandLine.run")
+    # Patch the subprocess launcher.
+    cmd_run_mock = mocker.patch("core.utils._run")
 
     segment_hypothalamus("series1", temp_dir)
     cmd_run_mock.assert_called_once()
+    assert cmd_run_mock.call_args.args[0][0] == "mri_segment_hypothalamic_subunits"
 
 
-def test_generate_json_files(temp_dir: Path, mocker):
+def test_generate_json_files(shared_fs_tree: Path, mocker):
     # Patch the functions in the module where generate_json_files is defined.
     jsonifier_mock = mocker.patch("core.processing.run_jsonifier")
-    json_average_mock = mocker.patch("core.processing.run_json_average")
+    json_averages_mock = mocker.patch("core.processing.run_json_averages")
     global_json_mock = mocker.patch("core.processing.run_global_json")
 
-    freesurfer_path = temp_dir / "FREESURFER"
-    samseg_path = temp_dir / "SAMSEG"
-    json_folder = temp_dir / "JSON"
-
-    # Ensure dummy directories exist.
-    for d in [freesurfer_path, samseg_path]:
-        d.mkdir(parents=True, exist_ok=True)
+    freesurfer_path = shared_fs_tree / "FREESURFER"
+    samseg_path = shared_fs_tree / "SAMSEG"
+    json_folder = shared_fs_tree / "JSON"
 
     generate_json_files(folders=["series1"], freesurfer_path=freesurfer_path, samseg_path=samseg_path, json_folder=json_folder)
 
     # Check that run_jsonifier was called with expected directories.
     jsonifier_mock.assert_called_once()
-    # Check that average JSON functions were called.
-    assert json_average_mock.call_count == 3
+    # Check that all three averages are computed in a single fused pass.
+    json_averages_mock.assert_called_once()
+    assert json_averages_mock.call_args.kwargs["main_types"] == [
+        "cortical.json", "subcortical.json", "general.json"
+    ]
     global_json_mock.assert_called_once()
 
 
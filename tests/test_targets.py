@@ -0,0 +1,86 @@
+import pytest
+from pathlib import Path
+
+from core.targets import Target, force, run_layered
+
+
+@pytest.fixture
+def temp_dir(tmp_path: Path) -> Path:
+    """
+    Returns a temporary directory as a pathlib.Path object.
+    """
+    return tmp_path
+
+
+def test_force_builds_missing_targets_in_dependency_order(temp_dir: Path):
+    """
+    Test that force builds dependencies before dependents and skips targets
+    whose output already exists.
+    """
+    order = []
+
+    def make(name):
+        path = temp_dir / name
+        def build():
+            order.append(name)
+            path.touch()
+        return Target(name=name, path=path, build=build)
+
+    recon = make("recon")
+    samseg = make("samseg")
+    samseg.deps = [recon]
+    corestats = make("corestats")
+    corestats.deps = [samseg]
+
+    # Pre-existing output short-circuits that node.
+    recon.path.touch()
+
+    force(corestats)
+
+    assert order == ["samseg", "corestats"]
+    assert corestats.path.exists()
+
+
+def test_force_memoizes_shared_dependencies(temp_dir: Path):
+    """
+    Test that a dependency shared by two downstream targets builds only once.
+    """
+    calls = []
+    shared = Target(
+        name="recon",
+        path=temp_dir / "recon",
+        build=lambda: calls.append("recon"),
+    )
+    left = Target(name="left", path=temp_dir / "left", build=lambda: None, deps=[shared])
+    right = Target(name="right", path=temp_dir / "right", build=lambda: None, deps=[shared])
+    top = Target(name="top", path=temp_dir / "top", build=lambda: None, deps=[left, right])
+
+    force(top)
+
+    assert calls == ["recon"]
+
+
+def test_run_layered_dispatches_dependencies_first(temp_dir: Path):
+    """
+    Test that run_layered builds every target once, with each target's
+    dependencies completed in an earlier layer.
+    """
+    order = []
+
+    def make(name, deps=()):
+        path = temp_dir / name
+        def build():
+            order.append(name)
+            path.touch()
+        return Target(name=name, path=path, build=build, deps=list(deps))
+
+    recon = make("recon")
+    samseg = make("samseg", deps=[recon])
+    thalamus = make("thalamus", deps=[recon])
+    corestats = make("corestats", deps=[samseg, thalamus])
+
+    run_layered([corestats], max_workers=2)
+
+    assert sorted(order) == ["corestats", "recon", "samseg", "thalamus"]
+    assert order[0] == "recon"
+    assert order[-1] == "corestats"
@@ -5,9 +5,13 @@ import numpy as np
 from numpy.typing import ArrayLike
 from core.utils import (
     add_dcm_extension,
+    add_dcm_extension_if_pixel_array,
+    add_dcm_extension_many,
+    add_dcm_extension_bulk,
     get_folder_names,
     create_folders,
     get_nifti_dimensions,
+    load_nifti_mmap,
     remove_double_extension,
 )
 
@@ -23,6 +27,39 @@ def test_add_dcm_extension(input_filename, expected):
     result = add_dcm_extension(input_filename)
     assert result == expected, f"Expected '{expected}', got '{result}'"
 
+# Tests for the header-only pixel-data probe.
+def test_add_dcm_extension_if_pixel_array(mocker):
+    import pydicom
+
+    ds_with_pixels = pydicom.Dataset()
+    ds_with_pixels.PixelData = b"\x00\x00"
+    mocker.patch("core.utils.pydicom.dcmread", return_value=ds_with_pixels)
+    assert add_dcm_extension_if_pixel_array("image") == "image.dcm"
+
+    mocker.patch("core.utils.pydicom.dcmread", return_value=pydicom.Dataset())
+    assert add_dcm_extension_if_pixel_array("DICOMDIR") == "DICOMDIR"
+
+    mocker.patch("core.utils.pydicom.dcmread", side_effect=ValueError("not DICOM"))
+    assert add_dcm_extension_if_pixel_array("notes.txt") == "notes.txt"
+
+
+def test_add_dcm_extension_bulk():
+    names = ["file", "file.dcm", "file.DCM", "file.txt"]
+    assert add_dcm_extension_bulk(names) == ["file.dcm", "file.dcm", "file.DCM", "file.txt.dcm"]
+    assert add_dcm_extension_bulk([]) == []
+
+
+def test_add_dcm_extension_many(mocker):
+    import pydicom
+
+    ds_with_pixels = pydicom.Dataset()
+    ds_with_pixels.PixelData = b"\x00\x00"
+    mocker.patch("core.utils.pydicom.dcmread", return_value=ds_with_pixels)
+
+    assert add_dcm_extension_many(["a", "b.dcm"]) == ["a.dcm", "b.dcm"]
+    assert add_dcm_extension_many([]) == []
+
+
 # Parameterized tests for remove_double_extension including a case-sensitivity check.
 @pytest.mark.parametrize("input_path,expected", [
     (Path("file.nii.gz"), "file"),
@@ -59,6 +96,24 @@ def test_get_nifti_dimensions(tmp_path):
     dims = get_nifti_dimensions(nifti_file)
     assert dims == (5, 10, 15), f"Expected dimensions (5, 10, 15), got {dims}"
 
+def test_load_nifti_mmap_crop(tmp_path):
+    # A crop should return only the requested slab without loading the full image.
+    nifti_file = tmp_path / "test.nii"
+    data: ArrayLike = np.zeros((5, 10, 15))
+    img = nib.Nifti1Image(data, affine=np.eye(4))
+    nib.save(img, nifti_file)
+    crop = load_nifti_mmap(nifti_file, crop=(slice(0, 2),) * 3)
+    assert crop.shape == (2, 2, 2), f"Expected crop shape (2, 2, 2), got {crop.shape}"
+    # Without a crop, the image is returned with a lazy data proxy.
+    loaded = load_nifti_mmap(nifti_file)
+    assert loaded.shape == (5, 10, 15)
+
+def test_load_nifti_mmap_nonexistent(tmp_path):
+    non_existent_file = tmp_path / "nonexistent.nii.gz"
+    with pytest.raises(FileNotFoundError) as excinfo:
+        load_nifti_mmap(non_existent_file)
+    assert "NIfTI file not found" in str(excinfo.value)
+
 def test_get_nifti_dimensions_nonexistent(tmp_path):
     # Test that a FileNotFoundError is raised for a missing file.
     non_existent_file = tmp_path / "nonexistent.nii.gz"